@@ -5,6 +5,10 @@ The gate validates:
 - Required governance evidence sections in PR body for policy/security-relevant changes
 - Optional vulnerability checks (if supported tools are installed)
 - Optional secret scanning (if supported tools are installed)
+
+Changed files are taken from `git diff --merge-base <base> <head>`, i.e. only what the PR
+branch changed since it diverged from base (three-dot semantics), not commits that landed
+on base afterwards.
 """
 from __future__ import annotations
 
@@ -14,8 +18,16 @@ import re
 import shutil
 import subprocess
 import sys
+import tempfile
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
 
+try:
+    # Optional faster parser; its JSONDecodeError subclasses json.JSONDecodeError.
+    from orjson import loads as json_loads
+except ImportError:
+    json_loads = json.loads
+
 
 REPO_ROOT = Path(__file__).resolve().parents[2]
 EVENT_PATH = os.environ.get("GITHUB_EVENT_PATH", str(REPO_ROOT / "event.json"))
@@ -26,60 +38,134 @@ REQUIRED_SECTIONS = {
     "verification evidence": [r"verification evidence", r"how to test"],
     "release notes": [r"release notes", r"release note"],
 }
+# One alternation with a named group per required key, so each heading is scanned once.
+REQUIRED_SECTION_GROUPS = {key.replace(" ", "_"): key for key in REQUIRED_SECTIONS}
+REQUIRED_SECTIONS_RE = re.compile(
+    "|".join(f"(?P<{key.replace(' ', '_')}>{'|'.join(aliases)})" for key, aliases in REQUIRED_SECTIONS.items()),
+    re.I,
+)
+GUARD_PREFIXES = (
+    "GOVERNANCE/",
+    "COMPLIANCE/",
+    "SECURITY/",
+    "EVALUATION/",
+    ".github/branch-protection-manifest.md",
+    ".github/workflows/gov-security-gates.yml",
+    ".github/scripts/gov_security_gates.py",
+    ".github/PULL_REQUEST_TEMPLATE.md",
+    ".github/CODEOWNERS",
+    "CODE_OF_CONDUCT.md",
+    "CONTRIBUTING.md",
+    "SUPPORT.md",
+    "SECURITY.md",
+    "CODEOWNERS",
+)
+BOOTSTRAP_ALLOWED_PREFIXES = (
+    '.github/',
+    'GOVERNANCE/',
+    'COMPLIANCE/',
+    'SECURITY/',
+    'EVALUATION/',
+)
+BOOTSTRAP_ALLOWED_FILES = (
+    'CODEOWNERS',
+    'SECURITY.md',
+    'SUPPORT.md',
+    'CONTRIBUTING.md',
+    'CODE_OF_CONDUCT.md',
+)
+# Prefixes and exact files above folded into one anchored pattern, so each path is a single match.
+BOOTSTRAP_ALLOWED_RE = re.compile(
+    "^(?:"
+    + "|".join(re.escape(prefix) for prefix in BOOTSTRAP_ALLOWED_PREFIXES)
+    + "|(?:"
+    + "|".join(re.escape(name) for name in BOOTSTRAP_ALLOWED_FILES)
+    + r")\Z)"
+)
+DEPENDENCY_FILES = (
+    "package.json",
+    "package-lock.json",
+    "pnpm-lock.yaml",
+    "yarn.lock",
+    "requirements.txt",
+    "poetry.lock",
+    "pyproject.toml",
+    "Cargo.toml",
+    "Cargo.lock",
+)
 PLACEHOLDER = re.compile(r"\[PROMPT:|TODO:|TBD|replace this|add\s+details", re.I)
+_WS_RE = re.compile(r"\s+")
 
 
-def run(cmd, cwd: Path | None = None) -> subprocess.CompletedProcess:
+def run(cmd, cwd: Path | None = None, text: bool = True) -> subprocess.CompletedProcess:
     return subprocess.run(
         cmd,
         cwd=str(cwd) if cwd else None,
-        text=True,
+        text=text,
         stdout=subprocess.PIPE,
         stderr=subprocess.PIPE,
     )
 
 
 def normalize(s: str) -> str:
-    return re.sub(r"\s+", " ", s.strip().lower())
-
-
-def split_sections(body: str):
-    sections = {}
-    heading = "_intro"
-    sections[heading] = []
-
+    return _WS_RE.sub(" ", s.strip().lower())
+
+
+def find_required_sections(body: str) -> dict[str, tuple[str, str]]:
+    """Map each found REQUIRED_SECTIONS key to `(text, normalized text)` of the first `##` heading matching it.
+
+    Text under a repeated heading is merged into its first occurrence. Only lines under
+    matched headings are kept, and headings stop being matched once every key has one.
+    """
+    found: dict[str, str] = {}  # required key -> heading
+    kept: dict[str, list[str]] = {}  # matched heading -> its lines
+    seen: set[str] = set()
+
+    def open_section(heading):
+        if heading not in seen:
+            seen.add(heading)
+            if len(found) < len(REQUIRED_SECTIONS):
+                for m in REQUIRED_SECTIONS_RE.finditer(heading):
+                    key = REQUIRED_SECTION_GROUPS[m.lastgroup]
+                    if key not in found:
+                        found[key] = heading
+                        kept.setdefault(heading, [])
+        return kept.get(heading)
+
+    lines = open_section("_intro")
     for line in body.splitlines():
-        m = re.match(r"^##\s*(.+)$", line)
-        if m:
-            heading = normalize(m.group(1))
-            sections.setdefault(heading, [])
+        # Equivalent to `^##\s*(.+)$` without entering the regex engine on every line.
+        if line.startswith("##") and len(line) > 2:
+            lines = open_section(normalize(line[2:]))
             continue
-        sections.setdefault(heading, []).append(line)
+        if lines is not None:
+            lines.append(line)
 
-    return {k: "\n".join(v).strip() for k, v in sections.items()}
+    # Join and normalize once per heading, even when one heading covers several keys
+    sections = {}
+    for heading, lines in kept.items():
+        text = "\n".join(lines).strip()
+        sections[heading] = (text, normalize(text))
+    return {key: sections[heading] for key, heading in found.items()}
 
 
-def section_has_content(text: str) -> bool:
+def section_has_content(text: str, compact: str) -> bool:
+    """Check a section body; `compact` is `normalize(text)`, computed once by the caller."""
     if not text:
         return False
     if PLACEHOLDER.search(text):
         return False
-    compact = normalize(text)
     if compact in {"n/a", "na", "none", "not applicable", "no security impact", "no ai impact"}:
         return False
     return bool(compact)
 
 
-def section_present(sections, keys):
-    for key, aliases in keys.items():
-        text = None
-        for heading, value in sections.items():
-            if any(re.search(alias, heading, re.I) for alias in aliases):
-                text = value
-                break
-        if text is None:
+def section_present(found):
+    for key in REQUIRED_SECTIONS:
+        if key not in found:
             return False, key
-        if key != "release notes" and not section_has_content(text):
+        text, compact = found[key]
+        if key != "release notes" and not section_has_content(text, compact):
             return False, key
         # release notes can be explicit "none", but should still be intentional and non-placeholder
         if key == "release notes" and (not text or PLACEHOLDER.search(text)):
@@ -91,7 +177,7 @@ def get_pr_context():
     if not Path(EVENT_PATH).exists():
         return None
     try:
-        payload = json.loads(Path(EVENT_PATH).read_text(encoding="utf-8"))
+        payload = json_loads(Path(EVENT_PATH).read_bytes())
     except json.JSONDecodeError:
         return None
 
@@ -107,141 +193,121 @@ def get_pr_context():
 
 
 def get_changed_file_status(base_sha: str | None, head_sha: str | None):
+    """Return `(status by path, rename/copy source paths)` for the PR diff.
+
+    Paths are keyed on their destination, matching `git diff --name-only`; the
+    sources are returned separately so moves out of guarded areas still count.
+    """
     if not base_sha or not head_sha:
-        return {}
-    cp = run(["git", "diff", "--name-status", base_sha, head_sha], cwd=REPO_ROOT)
+        return {}, set()
+    # Read as bytes: only the status and path fields need decoding, not the whole stream.
+    # -z keeps paths verbatim; without it git quotes non-ASCII, tab and '"' in names.
+    cp = run(["git", "diff", "-z", "--name-status", "--merge-base", base_sha, head_sha], cwd=REPO_ROOT, text=False)
+    if cp.returncode != 0:
+        # e.g. a shallow checkout without the merge base; a wider diff still gates safely
+        print("⚠️  Could not diff against the merge base; falling back to a direct base..head diff.")
+        cp = run(["git", "diff", "-z", "--name-status", base_sha, head_sha], cwd=REPO_ROOT, text=False)
     if cp.returncode != 0:
         print("⚠️  Could not compute git diff status for changed files.")
-        print(cp.stderr.strip())
-        return {}
+        print(cp.stderr.decode(errors="replace").strip())
+        return {}, set()
 
     out = {}
-    for line in cp.stdout.splitlines():
-        parts = line.split("	", 1)
-        if len(parts) != 2:
+    sources = set()
+    fields = iter(cp.stdout.split(b"\0"))
+    for status in fields:
+        if not status:
             continue
-        status, path = parts
-        out[path.strip()] = status.strip()
-    return out
-
-
-def get_changed_files(base_sha: str | None, head_sha: str | None):
-    if not base_sha or not head_sha:
-        return []
-    cp = run(["git", "diff", "--name-only", base_sha, head_sha], cwd=REPO_ROOT)
-    if cp.returncode != 0:
-        print("⚠️  Could not compute git diff for changed files.")
-        print(cp.stderr.strip())
-        return []
-    return [line.strip() for line in cp.stdout.splitlines() if line.strip()]
+        path = next(fields, b"")
+        # Renames/copies are "R100<NUL>old<NUL>new"; key on the new path like --name-only does.
+        if status[:1] in (b"R", b"C"):
+            sources.add(os.fsdecode(path))
+            path = next(fields, b"")
+        if path:
+            out[os.fsdecode(path)] = status.decode()
+    return out, sources
 
 
-def is_bootstrap_pr(changed_status: dict[str, str]) -> bool:
+def is_bootstrap_pr(changed_status: dict[str, str], renamed_from=()) -> bool:
     """Allow one-time baseline PRs to merge while introducing the gate itself."""
     if changed_status.get('.github/scripts/gov_security_gates.py') != 'A':
         return False
 
-    allowed_prefixes = (
-        '.github/',
-        'GOVERNANCE/',
-        'COMPLIANCE/',
-        'SECURITY/',
-        'EVALUATION/',
-    )
-    allowed_files = {
-        'CODEOWNERS',
-        'SECURITY.md',
-        'SUPPORT.md',
-        'CONTRIBUTING.md',
-        'CODE_OF_CONDUCT.md',
-    }
-
-    for path in changed_status.keys():
-        if path in allowed_files:
-            continue
-        if not path.startswith(allowed_prefixes):
-            return False
-    return True
+    # Rename/copy sources must be in the allowed area too, or a move from elsewhere would slip through
+    return all(BOOTSTRAP_ALLOWED_RE.match(path) for path in (*changed_status, *renamed_from))
 
 
 def should_gate(changed_files):
-    guard_paths = [
-        "GOVERNANCE/",
-        "COMPLIANCE/",
-        "SECURITY/",
-        "EVALUATION/",
-        ".github/branch-protection-manifest.md",
-        ".github/workflows/gov-security-gates.yml",
-        ".github/scripts/gov_security_gates.py",
-        ".github/PULL_REQUEST_TEMPLATE.md",
-        ".github/CODEOWNERS",
-        "CODE_OF_CONDUCT.md",
-        "CONTRIBUTING.md",
-        "SUPPORT.md",
-        "SECURITY.md",
-        "CODEOWNERS",
-    ]
-    return any(any(p.startswith(g) for g in guard_paths) for p in changed_files)
-
-
-def run_gitleaks_if_available():
+    return any(p.startswith(GUARD_PREFIXES) for p in changed_files)
+
+
+def run_gitleaks_if_available(changed_status, log=print):
     if not shutil.which("gitleaks"):
-        print("ℹ️  gitleaks not installed; skipping secret scan.")
+        log("ℹ️  gitleaks not installed; skipping secret scan.")
         return True
 
     report = Path("/tmp/gov-gitleaks-report.json")
-    cp = run(["gitleaks", "detect", "--no-git", "--redact", "--exit-code", "1", "--report-format", "json", "--report-path", str(report), "--source", str(REPO_ROOT)])
+    # Scan a copy of just the files this PR touches rather than the whole tree;
+    # deleted paths have nothing left to scan.
+    with tempfile.TemporaryDirectory(prefix="gov-gitleaks-") as scan_root:
+        source = scan_root
+        for rel, status in changed_status.items():
+            src = REPO_ROOT / rel
+            if status.startswith("D") or src.is_symlink():
+                continue
+            if not src.is_file():
+                # Never let a changed path silently drop out of the scan
+                log(f"⚠️  Could not resolve changed path {rel!r}; scanning the whole tree instead.")
+                source = str(REPO_ROOT)
+                break
+            dest = Path(scan_root) / rel
+            dest.parent.mkdir(parents=True, exist_ok=True)
+            shutil.copy2(src, dest)
+        cmd = ["gitleaks", "detect", "--no-git", "--redact", "--exit-code", "1", "--report-format", "json", "--report-path", str(report), "--source", source]
+        # gitleaks only discovers .gitleaks.toml in --source, so point it at the repo's config
+        config = REPO_ROOT / ".gitleaks.toml"
+        if config.exists():
+            cmd += ["--config", str(config)]
+        cp = run(cmd)
     if cp.returncode == 0:
-        print("✅ gitleaks: no findings")
+        log("✅ gitleaks: no findings")
         return True
 
-    print("❌ gitleaks found issues.")
+    log("❌ gitleaks found issues.")
     if cp.stdout.strip():
-        print(cp.stdout)
+        log(cp.stdout)
     if cp.stderr.strip():
-        print(cp.stderr)
+        log(cp.stderr)
     return False
 
 
-def run_dependency_scan_if_available(changed_files):
-    dep_files = [
-        "package.json",
-        "package-lock.json",
-        "pnpm-lock.yaml",
-        "yarn.lock",
-        "requirements.txt",
-        "poetry.lock",
-        "pyproject.toml",
-        "Cargo.toml",
-        "Cargo.lock",
-    ]
-
-    if not any(any(f.endswith(item) for item in dep_files) for f in changed_files):
+def run_dependency_scan_if_available(changed_files, log=print):
+    if not any(f.endswith(DEPENDENCY_FILES) for f in changed_files):
         return True
 
     if shutil.which("pnpm") and (REPO_ROOT / "pnpm-lock.yaml").exists():
-        print("Running pnpm audit (audit-level high)...")
+        log("Running pnpm audit (audit-level high)...")
         cp = run(["pnpm", "audit", "--audit-level", "high"], cwd=REPO_ROOT)
         if cp.returncode != 0:
-            print("❌ pnpm audit reported issues.")
-            print(cp.stdout)
-            print(cp.stderr)
+            log("❌ pnpm audit reported issues.")
+            log(cp.stdout)
+            log(cp.stderr)
             return False
-        print("✅ pnpm audit passed")
+        log("✅ pnpm audit passed")
         return True
 
     if shutil.which("npm") and (REPO_ROOT / "package-lock.json").exists():
-        print("Running npm audit (audit-level high)...")
+        log("Running npm audit (audit-level high)...")
         cp = run(["npm", "audit", "--audit-level", "high"], cwd=REPO_ROOT)
         if cp.returncode != 0:
-            print("⚠️  npm audit failed; leaving as warning because toolchain may differ in CI.")
-            print(cp.stdout)
-            print(cp.stderr)
+            log("⚠️  npm audit failed; leaving as warning because toolchain may differ in CI.")
+            log(cp.stdout)
+            log(cp.stderr)
             return True
-        print("✅ npm audit passed")
+        log("✅ npm audit passed")
         return True
 
-    print("ℹ️  No supported dependency scanner available for this stack.")
+    log("ℹ️  No supported dependency scanner available for this stack.")
     return True
 
 
@@ -254,8 +320,7 @@ def has_transitional_evidence(pr_body: str) -> bool:
 
 
 def check_pr_evidence(pr_body: str) -> bool:
-    sections = split_sections(pr_body)
-    ok, missing = section_present(sections, REQUIRED_SECTIONS)
+    ok, missing = section_present(find_required_sections(pr_body))
     if ok:
         return True
     if has_transitional_evidence(pr_body):
@@ -268,27 +333,37 @@ def check_pr_evidence(pr_body: str) -> bool:
 
 def main() -> int:
     context = get_pr_context()
-    changed_files = get_changed_files(context["base"] if context else None, context["head"] if context else None) if context else []
-    changed_status = get_changed_file_status(context["base"] if context else None, context["head"] if context else None) if context else {}
+    changed_status, renamed_from = get_changed_file_status(context["base"], context["head"]) if context else ({}, set())
+    changed_files = list(changed_status)
 
     print(f"🔎 Reviewed {len(changed_files)} changed file(s) in scope candidate set.")
-    if not should_gate(changed_files):
+    # Include rename/copy sources so moving a file out of a guarded path still gates
+    if not should_gate([*changed_files, *renamed_from]):
         print("✅ No governance-sensitive path changes detected; skip PR evidence strict mode.")
         return 0
 
     failed = False
     if context and context.get("body") is not None:
-        if is_bootstrap_pr(changed_status):
+        if is_bootstrap_pr(changed_status, renamed_from):
             print("ℹ️  Bootstrap governance PR detected; skipping strict PR evidence check once.")
         elif not check_pr_evidence(context["body"]):
             failed = True
     else:
         print("⚠️  No PR body available; skipping PR evidence check.")
 
-    if not run_gitleaks_if_available():
+    # The scans are independent subprocesses; run them side by side and print
+    # their buffered output afterwards so it is not interleaved.
+    gitleaks_log, dependency_log = [], []
+    with ThreadPoolExecutor(max_workers=2) as executor:
+        gitleaks = executor.submit(run_gitleaks_if_available, changed_status, gitleaks_log.append)
+        dependency_scan = executor.submit(run_dependency_scan_if_available, changed_files, dependency_log.append)
+    for line in gitleaks_log + dependency_log:
+        print(line)
+
+    if not gitleaks.result():
         failed = True
 
-    if not run_dependency_scan_if_available(changed_files):
+    if not dependency_scan.result():
         failed = True
 
     return 1 if failed else 0
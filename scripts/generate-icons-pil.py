@@ -11,9 +11,17 @@ IMPORTANT:
 import os
 import subprocess
 import sys
+from concurrent.futures import ThreadPoolExecutor
+from functools import lru_cache
 from pathlib import Path
+import numpy as np
 from PIL import Image, ImageDraw, ImageFilter
 
+# zlib levels for PNG output: files bundled via tauri.conf.json (and the iconset
+# that becomes icon.icns) keep Pillow's default; debug/Store copies favour speed.
+PNG_COMPRESS_LEVEL = 6
+PNG_FAST_COMPRESS_LEVEL = 1
+
 def create_icon(size):
     """Create the Narrative app icon at the specified size.
 
@@ -34,20 +42,14 @@ def create_icon(size):
     # macOS/iOS style rounded corners
     corner_radius = int(size * 0.22)
     
-    # Create base image with subtle gradient (stone-100 to stone-200)
-    img = Image.new('RGB', (size, size), stone_100)
-    draw = ImageDraw.Draw(img)
-    
-    # Subtle vertical gradient overlay
-    for y in range(size):
-        ratio = y / size
-        r = int(stone_100[0] + (stone_200[0] - stone_100[0]) * ratio * 0.3)
-        g = int(stone_100[1] + (stone_200[1] - stone_100[1]) * ratio * 0.3)
-        b = int(stone_100[2] + (stone_200[2] - stone_100[2]) * ratio * 0.3)
-        draw.line([(0, y), (size, y)], fill=(r, g, b))
-    
-    # Convert to RGBA for transparency support
-    img = img.convert('RGBA')
+    # Subtle vertical gradient (stone-100 to stone-200), built directly in RGBA.
+    # Columns are identical, so build a 1px-wide strip and stretch it horizontally
+    ratio = (np.arange(size, dtype=np.float64) / size * 0.3)[:, None]
+    base = np.array(stone_100, dtype=np.float64)
+    delta = np.array(stone_200, dtype=np.float64) - base
+    strip = np.full((size, 1, 4), 255, dtype=np.uint8)
+    strip[:, 0, :3] = (base + delta * ratio).astype(np.uint8)
+    img = Image.fromarray(strip, 'RGBA').resize((size, size), Image.Resampling.NEAREST)
     
     # Create mask for rounded corners
     mask = Image.new('L', (size, size), 0)
@@ -74,14 +76,19 @@ def create_icon(size):
     y_top = int(size * 0.36)
     y_bot = int(size * 0.68)
 
-    # Shadow (very subtle) for the whole mark
-    shadow = Image.new('RGBA', (size, size), (0, 0, 0, 0))
+    # Shadow (very subtle) for the whole mark. It is drawn on a band just tall
+    # enough for the mark plus blur spread, so the blur only touches that band.
+    blur_radius = max(1, size // 64)
+    band_top = max(0, y_top - node_radius - 4 * blur_radius)
+    band_bot = min(size, y_bot + node_radius + 4 * blur_radius)
+    shadow = Image.new('RGBA', (size, band_bot - band_top), (0, 0, 0, 0))
     sd = ImageDraw.Draw(shadow)
-    sd.line([(x0, y_top), (center, y_mid), (x1, y_bot)], fill=(0, 0, 0, 55), width=line_width)
-    sd.ellipse([x0 - node_radius, y_top - node_radius, x0 + node_radius, y_top + node_radius], fill=(0, 0, 0, 55))
-    sd.ellipse([x1 - node_radius, y_bot - node_radius, x1 + node_radius, y_bot + node_radius], fill=(0, 0, 0, 55))
-    shadow = shadow.filter(ImageFilter.GaussianBlur(radius=max(1, size // 64)))
-    img.alpha_composite(shadow, (0, int(size * 0.02)))
+    sy_top, sy_mid, sy_bot = y_top - band_top, y_mid - band_top, y_bot - band_top
+    sd.line([(x0, sy_top), (center, sy_mid), (x1, sy_bot)], fill=(0, 0, 0, 55), width=line_width)
+    sd.ellipse([x0 - node_radius, sy_top - node_radius, x0 + node_radius, sy_top + node_radius], fill=(0, 0, 0, 55))
+    sd.ellipse([x1 - node_radius, sy_bot - node_radius, x1 + node_radius, sy_bot + node_radius], fill=(0, 0, 0, 55))
+    shadow = shadow.filter(ImageFilter.GaussianBlur(radius=blur_radius))
+    img.alpha_composite(shadow, (0, band_top + int(size * 0.02)))
 
     # Main curve (accent)
     draw.line([(x0, y_top), (center, y_mid), (x1, y_bot)], fill=sky_500, width=line_width, joint="curve")
@@ -125,25 +132,36 @@ def create_icns(iconset_dir, output_path):
         print("iconutil not found (macOS only)")
         return False
 
-def create_ico(images, output_path):
-    """Create .ico file from PIL images."""
-    ico_images = []
-    for size in [16, 32, 48, 64, 128, 256]:
-        if size <= max(img.width for img in images):
-            largest = max(images, key=lambda x: x.width)
-            resized = largest.resize((size, size), Image.Resampling.LANCZOS)
-            ico_images.append(resized)
+def create_ico(resized, output_path):
+    """Create .ico file from a `resized(size)` function returning PIL images."""
+    ico_images = [resized(size) for size in [16, 32, 48, 64, 128, 256]]
     
-    if ico_images:
-        ico_images[0].save(
-            output_path,
-            format='ICO',
-            sizes=[(img.width, img.height) for img in ico_images],
-            append_images=ico_images[1:]
-        )
-        print(f"Created: {output_path.name}")
-        return True
-    return False
+    ico_images[0].save(
+        output_path,
+        format='ICO',
+        sizes=[(img.width, img.height) for img in ico_images],
+        append_images=ico_images[1:]
+    )
+    print(f"Created: {output_path.name}")
+    return True
+
+def save_pngs(tasks):
+    """Save `(image, path, compress_level)` entries as PNGs concurrently.
+
+    The PNG encoder releases the GIL while compressing. Paths sharing an image
+    are written by a single worker, since `Image.save` mutates per-image state.
+    """
+    by_image = {}
+    for img, path, compress_level in tasks:
+        by_image.setdefault(id(img), (img, []))[1].append((path, compress_level))
+
+    def save_all(entry):
+        img, targets = entry
+        for path, compress_level in targets:
+            img.save(path, 'PNG', compress_level=compress_level, optimize=False)
+
+    with ThreadPoolExecutor(max_workers=os.cpu_count()) as executor:
+        list(executor.map(save_all, by_image.values()))
 
 def main():
     script_dir = Path(__file__).parent
@@ -161,14 +179,26 @@ def main():
     # Generate standard icon sizes (we'll also write filenames Tauri expects)
     print("=== Generating PNG Icons ===")
     standard_sizes = [32, 64, 128, 256, 512, 1024]
-    generated_images = {}
-    
+    # Native renders keep create_icon's small-size geometry floors; they feed the
+    # debug copies and the @1x iconset entries packed into icon.icns
+    renders = {size: create_icon(size) for size in standard_sizes}
+    master = renders[1024]
+
+    # Everything else is a downsample of the 1024 master, shared across outputs
+
+    @lru_cache(maxsize=None)
+    def resized(size):
+        """Return the master downsampled to `size`, computing each size only once."""
+        if size == master.width:
+            return master
+        return master.resize((size, size), Image.Resampling.LANCZOS)
+
+    png_tasks = []
     for size in standard_sizes:
-        img = create_icon(size)
-        generated_images[size] = img
+        img = renders[size]
         # Keep `icon{size}x{size}.png` for convenience/debugging
         debug_path = icons_dir / f"icon{size}x{size}.png"
-        img.save(debug_path, 'PNG')
+        png_tasks.append((img, debug_path, PNG_FAST_COMPRESS_LEVEL))
         print(f"  {debug_path.name}")
 
     # Write the exact filenames referenced by tauri.conf.json
@@ -180,12 +210,14 @@ def main():
         (256, "128x128@2x.png"),
     ]
     for sz, name in tauri_named:
-        generated_images[1024].resize((sz, sz), Image.Resampling.LANCZOS).save(icons_dir / name, 'PNG')
+        # 64x64.png is not listed in bundle.icon, so it only needs to be written quickly
+        level = PNG_FAST_COMPRESS_LEVEL if name == "64x64.png" else PNG_COMPRESS_LEVEL
+        png_tasks.append((resized(sz), icons_dir / name, level))
         print(f"  {name}")
     
     # Create main icon.png (copy of 1024)
     main_icon_path = icons_dir / "icon.png"
-    generated_images[1024].save(main_icon_path, 'PNG')
+    png_tasks.append((master, main_icon_path, PNG_COMPRESS_LEVEL))
     print(f"  icon.png (1024x1024)")
     
     # Generate macOS iconset
@@ -194,21 +226,19 @@ def main():
     macos_sizes = [16, 32, 64, 128, 256, 512, 1024]
     
     for size in macos_sizes:
-        if size in generated_images:
-            img = generated_images[size]
-        else:
-            img = generated_images[1024].resize((size, size), Image.Resampling.LANCZOS)
+        img = renders[size] if size in renders else resized(size)
         
         # Normal DPI
         png_path = iconset_dir / f"icon_{size}x{size}.png"
-        img.save(png_path, 'PNG')
+        png_tasks.append((img, png_path, PNG_COMPRESS_LEVEL))
         
         # High DPI (@2x)
         if size <= 512:
             png_path_2x = iconset_dir / f"icon_{size}x{size}@2x.png"
-            img_2x = generated_images[1024].resize((size * 2, size * 2), Image.Resampling.LANCZOS)
-            img_2x.save(png_path_2x, 'PNG')
+            png_tasks.append((resized(size * 2), png_path_2x, PNG_COMPRESS_LEVEL))
     
+    # iconutil reads the iconset from disk, so flush pending writes first
+    save_pngs(png_tasks)
     print(f"  Generated {len(macos_sizes)} iconset entries")
     
     # Create .icns
@@ -222,11 +252,11 @@ def main():
     
     # Create .ico for Windows
     ico_path = icons_dir / "icon.ico"
-    create_ico(list(generated_images.values()), ico_path)
+    create_ico(resized, ico_path)
     
     # Windows Store assets (keep in sync so packaging looks consistent)
     store_logo = icons_dir / "StoreLogo.png"
-    generated_images[1024].resize((50, 50), Image.Resampling.LANCZOS).save(store_logo, 'PNG')
+    store_tasks = [(resized(50), store_logo, PNG_FAST_COMPRESS_LEVEL)]
     print("  StoreLogo.png")
 
     square_logos = [
@@ -241,8 +271,9 @@ def main():
         (310, "Square310x310Logo.png"),
     ]
     for sz, name in square_logos:
-        generated_images[1024].resize((sz, sz), Image.Resampling.LANCZOS).save(icons_dir / name, 'PNG')
+        store_tasks.append((resized(sz), icons_dir / name, PNG_FAST_COMPRESS_LEVEL))
         # too noisy to print each; keep list at end
+    save_pngs(store_tasks)
     
     print()
     print("=== Icon Generation Complete ===")